@@ -8,19 +8,52 @@ Streamlit Community Cloud 배포용 - st.secrets 사용
 
 import streamlit as st
 import yfinance as yf
+from curl_cffi import requests as curl_requests
 import pandas as pd
 import numpy as np
 import requests
-from datetime import datetime, timedelta
-import pytz
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from datetime import datetime, timedelta, time as dt_time
+from zoneinfo import ZoneInfo
 import time
-import json
+import sqlite3
 import os
+import threading
+import queue
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 # ============================================================
-# 쿨다운 파일 경로 (Streamlit Cloud에서는 /tmp 사용)
+# 시간대 (호출마다 새로 만들지 않도록 한 번만 생성)
 # ============================================================
-COOLDOWN_FILE = "/tmp/stock_alert_cooldown.json"
+NY_TZ = ZoneInfo('America/New_York')
+KR_TZ = ZoneInfo('Asia/Seoul')
+
+# 뉴욕 증시 정규장 시간 (뉴욕 현지 시각)
+MARKET_OPEN = dt_time(9, 30)
+MARKET_CLOSE = dt_time(16, 0)
+MARKET_SETTLE = dt_time(16, 5)  # 장 마감 후 마지막 1분봉까지 받을 수 있다고 보는 시각
+
+# ============================================================
+# 스타일시트 경로
+# ============================================================
+CSS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "style.css")
+
+# ============================================================
+# 쿨다운 DB 경로 (Streamlit Cloud에서는 /tmp 사용)
+# ============================================================
+COOLDOWN_DB = "/tmp/stock_alert_cooldown.db"
+
+# ============================================================
+# yfinance 디스크 캐시 (재배포/재시작 후에도 유효한 일봉 데이터 재사용)
+# ============================================================
+YF_CACHE_DIR = "/tmp/yf_cache"
+YF_MAX_WORKERS = 8  # 종목별 동시 요청 수 상한 (야후 rate limit 방지)
+PRICE_FIELDS = ('Open', 'High', 'Low', 'Close', 'Adj Close')
+YF_CACHE_TTL = {
+    "1d": 24 * 3600,    # 일봉: 뉴욕 날짜가 바뀌기 전까지 (파일명에 날짜 포함)
+}
 
 # ============================================================
 # 페이지 설정
@@ -47,203 +80,93 @@ def get_telegram_config():
 BOT_TOKEN, CHAT_ID = get_telegram_config()
 
 # ============================================================
-# 쿨다운 관리 함수들 (파일 기반 - 안정적)
+# 쿨다운 관리 함수들 (세션 메모리 + SQLite 저장)
 # ============================================================
+@st.cache_resource
+def get_cooldown_db():
+    """쿨다운 SQLite 연결 - 앱 전체에서 하나를 재사용합니다."""
+    # autocommit이라 문장마다 바로 기록되고, 직렬화 모드 sqlite3라 여러 스레드에서 함께 씁니다
+    conn = sqlite3.connect(COOLDOWN_DB, check_same_thread=False, isolation_level=None)
+    conn.execute("CREATE TABLE IF NOT EXISTS cooldowns (ticker TEXT PRIMARY KEY, ts REAL)")
+    return conn
+
+
 def load_cooldown_data():
-    """쿨다운 데이터를 파일에서 불러옵니다."""
+    """쿨다운 데이터를 DB에서 불러옵니다."""
     try:
-        if os.path.exists(COOLDOWN_FILE):
-            with open(COOLDOWN_FILE, 'r') as f:
-                data = json.load(f)
-                return {k: datetime.fromisoformat(v) for k, v in data.items()}
+        rows = get_cooldown_db().execute("SELECT ticker, ts FROM cooldowns").fetchall()
+        return {ticker: datetime.fromtimestamp(ts) for ticker, ts in rows}
     except Exception:
-        pass
-    return {}
+        return {}
 
 
-def save_cooldown_data(data):
-    """쿨다운 데이터를 파일에 저장합니다."""
+def reset_cooldown_data():
+    """쿨다운 데이터를 모두 지웁니다."""
+    st.session_state.cooldowns = {}
     try:
-        serializable = {k: v.isoformat() for k, v in data.items()}
-        with open(COOLDOWN_FILE, 'w') as f:
-            json.dump(serializable, f)
+        get_cooldown_db().execute("DELETE FROM cooldowns")
     except Exception:
         pass
 
 
-def can_send_alert(ticker, cooldown_minutes=30):
-    """알림 쿨다운 체크 (파일 기반)"""
-    cooldown_data = load_cooldown_data()
-    now = datetime.now()
-    last_alert = cooldown_data.get(ticker)
+def get_last_alert_time(ticker, cooldowns):
+    """특정 종목의 마지막 알림 시간 조회"""
+    return cooldowns.get(ticker)
+
+
+def get_cooldown_remaining(ticker, cooldowns, cooldown_minutes=30, now=None):
+    """다음 알림까지 남은 쿨다운 시간(분) - 알림 가능하면 0"""
+    last_alert = get_last_alert_time(ticker, cooldowns)
     
     if last_alert is None:
-        return True
+        return 0
     
-    time_diff = (now - last_alert).total_seconds() / 60
-    return time_diff >= cooldown_minutes
+    if now is None:
+        now = datetime.now()
+    elapsed = (now - last_alert).total_seconds() / 60
+    return max(0, cooldown_minutes - elapsed)
 
 
-def record_alert(ticker):
-    """알림 발송 기록 저장 (파일 기반)"""
-    cooldown_data = load_cooldown_data()
-    cooldown_data[ticker] = datetime.now()
-    save_cooldown_data(cooldown_data)
+def can_send_alert(ticker, cooldowns, cooldown_minutes=30, now=None):
+    """알림 쿨다운 체크 (갱신 시작 시 넘겨받은 쿨다운 dict 기준)"""
+    return get_cooldown_remaining(ticker, cooldowns, cooldown_minutes, now) <= 0
 
 
-def get_last_alert_time(ticker):
-    """특정 종목의 마지막 알림 시간 조회"""
-    cooldown_data = load_cooldown_data()
-    return cooldown_data.get(ticker)
+def record_alert(ticker, cooldowns, now=None):
+    """알림 발송 기록 저장 (해당 종목 한 행만 DB에 기록)"""
+    cooldowns[ticker] = now if now is not None else datetime.now()
+    try:
+        get_cooldown_db().execute(
+            "INSERT OR REPLACE INTO cooldowns (ticker, ts) VALUES (?, ?)",
+            (ticker, cooldowns[ticker].timestamp())
+        )
+    except Exception:
+        pass
 
 
 def clear_old_cooldowns(hours=24):
     """오래된 쿨다운 데이터 정리 (24시간 이상)"""
-    cooldown_data = load_cooldown_data()
     now = datetime.now()
-    cleaned = {k: v for k, v in cooldown_data.items() 
-               if (now - v).total_seconds() < hours * 3600}
-    save_cooldown_data(cleaned)
+    st.session_state.cooldowns = {k: v for k, v in st.session_state.cooldowns.items() 
+                                  if (now - v).total_seconds() < hours * 3600}
+    try:
+        cutoff = (now - timedelta(hours=hours)).timestamp()
+        get_cooldown_db().execute("DELETE FROM cooldowns WHERE ts < ?", (cutoff,))
+    except Exception:
+        pass
 
 
 # ============================================================
 # 커스텀 CSS 스타일링
 # ============================================================
-st.markdown("""
-<style>
-    @import url('https://fonts.googleapis.com/css2?family=Noto+Sans+KR:wght@300;400;500;700&family=JetBrains+Mono:wght@400;500&display=swap');
-    
-    * {
-        font-family: 'Noto Sans KR', sans-serif;
-    }
-    
-    .main {
-        background: linear-gradient(135deg, #0f0f23 0%, #1a1a2e 50%, #16213e 100%);
-    }
-    
-    .stApp {
-        background: linear-gradient(135deg, #0f0f23 0%, #1a1a2e 50%, #16213e 100%);
-    }
-    
-    h1, h2, h3 {
-        color: #00d4aa !important;
-        font-weight: 700 !important;
-    }
-    
-    .metric-card {
-        background: linear-gradient(145deg, #1e1e3f 0%, #2d2d5a 100%);
-        border-radius: 16px;
-        padding: 20px;
-        border: 1px solid #3d3d6b;
-        box-shadow: 0 8px 32px rgba(0, 212, 170, 0.1);
-    }
-    
-    .status-open {
-        background: linear-gradient(90deg, #00d4aa, #00b894);
-        color: #0f0f23;
-        padding: 8px 16px;
-        border-radius: 20px;
-        font-weight: 700;
-        display: inline-block;
-    }
-    
-    .status-closed {
-        background: linear-gradient(90deg, #e74c3c, #c0392b);
-        color: white;
-        padding: 8px 16px;
-        border-radius: 20px;
-        font-weight: 700;
-        display: inline-block;
-    }
-    
-    .signal-alert {
-        background: linear-gradient(145deg, #e74c3c, #c0392b);
-        color: white;
-        padding: 16px;
-        border-radius: 12px;
-        margin: 10px 0;
-        font-weight: 500;
-        animation: pulse 2s infinite;
-    }
-    
-    @keyframes pulse {
-        0% { box-shadow: 0 0 0 0 rgba(231, 76, 60, 0.7); }
-        70% { box-shadow: 0 0 0 10px rgba(231, 76, 60, 0); }
-        100% { box-shadow: 0 0 0 0 rgba(231, 76, 60, 0); }
-    }
-    
-    .stDataFrame {
-        background: #1e1e3f !important;
-        border-radius: 12px !important;
-    }
-    
-    div[data-testid="stDataFrame"] > div {
-        background: #1e1e3f !important;
-        border-radius: 12px !important;
-    }
-    
-    .stButton > button {
-        background: linear-gradient(90deg, #00d4aa, #00b894) !important;
-        color: #0f0f23 !important;
-        font-weight: 700 !important;
-        border: none !important;
-        border-radius: 12px !important;
-        padding: 12px 24px !important;
-        font-size: 16px !important;
-        transition: all 0.3s ease !important;
-    }
-    
-    .stButton > button:hover {
-        transform: translateY(-2px) !important;
-        box-shadow: 0 8px 24px rgba(0, 212, 170, 0.4) !important;
-    }
-    
-    .sidebar .stTextInput > div > div > input {
-        background: #2d2d5a !important;
-        border: 1px solid #3d3d6b !important;
-        color: white !important;
-        border-radius: 8px !important;
-    }
-    
-    section[data-testid="stSidebar"] {
-        background: linear-gradient(180deg, #1a1a2e 0%, #16213e 100%) !important;
-        border-right: 1px solid #3d3d6b !important;
-    }
-    
-    .info-box {
-        background: linear-gradient(145deg, #2d2d5a, #1e1e3f);
-        border-left: 4px solid #00d4aa;
-        padding: 16px;
-        border-radius: 0 12px 12px 0;
-        margin: 16px 0;
-    }
-    
-    .config-status {
-        padding: 12px;
-        border-radius: 8px;
-        margin: 8px 0;
-    }
-    
-    .config-ok {
-        background: rgba(0, 212, 170, 0.2);
-        border: 1px solid #00d4aa;
-    }
-    
-    .config-error {
-        background: rgba(231, 76, 60, 0.2);
-        border: 1px solid #e74c3c;
-    }
-    
-    .cooldown-info {
-        background: rgba(241, 196, 15, 0.2);
-        border: 1px solid #f1c40f;
-        padding: 8px 12px;
-        border-radius: 8px;
-        font-size: 0.85em;
-        margin-top: 8px;
-    }
-</style>
-""", unsafe_allow_html=True)
+@st.cache_data
+def load_css():
+    """static/style.css를 한 번만 읽어 재실행마다 재사용합니다."""
+    with open(CSS_FILE, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+st.markdown(f"<style>{load_css()}</style>", unsafe_allow_html=True)
 
 # ============================================================
 # 세션 상태 초기화
@@ -254,6 +177,13 @@ if 'watchlist' not in st.session_state:
 if 'alert_history' not in st.session_state:
     st.session_state.alert_history = []
 
+if 'monitoring' not in st.session_state:
+    st.session_state.monitoring = False
+
+# 다른 탭/세션이 보낸 알림과 초기화도 반영되도록 실행마다 DB를 한 번 읽고,
+# 실행 안에서는 메모리에서 조회합니다
+st.session_state.cooldowns = load_cooldown_data()
+
 if 'cooldown_cleaned' not in st.session_state:
     clear_old_cooldowns(24)
     st.session_state.cooldown_cleaned = True
@@ -262,71 +192,336 @@ if 'cooldown_cleaned' not in st.session_state:
 # 유틸리티 함수들
 # ============================================================
 
-def calculate_rsi(prices, period=14):
-    """RSI (상대강도지수) 직접 계산"""
-    delta = prices.diff()
+def _wilder_last(values, period):
+    """Wilder 평활의 마지막 값 - 첫 period개의 단순평균을 시드로 재귀식을 적용합니다."""
+    # 재귀식을 풀면 시드는 decay ** n, 그 뒤 값은 alpha * decay ** (뒤에 남은 개수)의 가중치를 받습니다
+    alpha = 1.0 / period
+    decay = 1.0 - alpha
+    rest = values[period:]
+    weights = alpha * decay ** np.arange(len(rest) - 1, -1, -1)
+    return values[:period].mean() * decay ** len(rest) + weights @ rest
+
+
+@st.cache_resource
+def get_rsi_state_store():
+    """종목별 RSI 증분 계산 상태 - (평균 상승폭, 평균 하락폭, 마지막 종가, 마지막 봉 시각)"""
+    return {}
+
+
+def _wilder_averages(closes, period=14):
+    """종가 배열 마지막 시점의 Wilder 평균 상승폭/하락폭 (데이터가 부족하면 None)"""
+    delta = np.diff(closes)
+    if len(delta) < period:
+        return None
     
-    gain = delta.where(delta > 0, 0)
-    loss = (-delta).where(delta < 0, 0)
+    avg_gain = _wilder_last(np.maximum(delta, 0), period)
+    avg_loss = _wilder_last(np.maximum(-delta, 0), period)
+    return avg_gain, avg_loss
+
+
+def update_rsi_incremental(ticker, closes, period=14):
+    """종목의 최신 RSI를 증분 계산 (새로 들어온 봉에만 Wilder 한 단계씩 적용)"""
+    closes = closes.dropna()
+    store = get_rsi_state_store()
+    
+    if len(closes) < period + 2:
+        store.pop(ticker, None)
+        return None
+    
+    # 확정된 봉(마지막 봉 직전까지)만 상태에 저장합니다
+    confirmed = closes.iloc[:-1]
+    state = store.get(ticker)
     
-    avg_gain = gain.rolling(window=period, min_periods=period).mean()
-    avg_loss = loss.rolling(window=period, min_periods=period).mean()
+    # 저장된 마지막 봉이 그대로 남아 있으면 그 뒤의 봉만, 아니면 전체 구간으로 다시 시드
+    if state is not None and state[3] in confirmed.index and confirmed.loc[state[3]] == state[2]:
+        avg_gain, avg_loss, last_close, last_ts = state
+        for close in confirmed[confirmed.index > last_ts].to_numpy(dtype=np.float64):
+            delta = close - last_close
+            avg_gain = (avg_gain * (period - 1) + max(delta, 0.0)) / period
+            avg_loss = (avg_loss * (period - 1) + max(-delta, 0.0)) / period
+            last_close = close
+    else:
+        values = confirmed.to_numpy(dtype=np.float64)
+        avg_gain, avg_loss = _wilder_averages(values, period)
+        last_close = values[-1]
+    
+    store[ticker] = (avg_gain, avg_loss, last_close, confirmed.index[-1])
     
-    rs = avg_gain / avg_loss
-    rsi = 100 - (100 / (1 + rs))
+    # 진행 중인 마지막 봉은 상태를 바꾸지 않고 한 단계만 적용해 봅니다
+    delta = float(closes.iloc[-1]) - last_close
+    avg_gain = (avg_gain * (period - 1) + max(delta, 0.0)) / period
+    avg_loss = (avg_loss * (period - 1) + max(-delta, 0.0)) / period
     
-    return rsi
+    # 하락이 없으면 100, 변동이 전혀 없으면 None
+    total = avg_gain + avg_loss
+    if total <= 0:
+        return None
+    return float(100 * avg_gain / total)
 
 
 def is_market_open():
     """미국 뉴욕 증시 개장 시간인지 확인 (09:30 ~ 16:00 EST)"""
-    ny_tz = pytz.timezone('America/New_York')
-    now_ny = datetime.now(ny_tz)
+    now_ny = datetime.now(NY_TZ)
     
     if now_ny.weekday() >= 5:
         return False, now_ny, "주말"
     
-    market_open = now_ny.replace(hour=9, minute=30, second=0, microsecond=0)
-    market_close = now_ny.replace(hour=16, minute=0, second=0, microsecond=0)
+    now_time = now_ny.time()
     
-    if market_open <= now_ny <= market_close:
+    if MARKET_OPEN <= now_time <= MARKET_CLOSE:
         return True, now_ny, "개장 중"
-    elif now_ny < market_open:
+    elif now_time < MARKET_OPEN:
         return False, now_ny, "개장 전"
     else:
         return False, now_ny, "장 마감"
 
 
-@st.cache_data(ttl=60)
-def get_stock_data(ticker, _cache_buster=None):
-    """주식 데이터 가져오기 (1분 단위, 최근 5일) - 캐싱 적용"""
-    try:
-        stock = yf.Ticker(ticker)
-        df = stock.history(period="5d", interval="1m")
-        
-        if df.empty:
-            return None, None, None, None, None
+def _ticker_frame(df, ticker):
+    """yf.download 일괄 결과에서 특정 종목의 데이터만 잘라냅니다."""
+    if df is None or df.empty:
+        return pd.DataFrame()
+    if isinstance(df.columns, pd.MultiIndex):
+        if ticker not in df.columns.get_level_values(0):
+            return pd.DataFrame()
+        df = df[ticker]
+    return df.dropna(subset=['Close'])
+
+
+@st.cache_resource
+def get_yf_session():
+    """yfinance용 HTTP 세션 - 앱 전체에서 공유해 TLS 연결과 야후 쿠키를 재사용합니다."""
+    # session을 넘기지 않으면 yf.download가 호출마다 새 세션으로 갈아 끼웁니다
+    return curl_requests.Session(impersonate="chrome")
+
+
+def download_bars(tickers, interval, session):
+    """yf.download로 여러 종목의 최근 5일 봉을 한 번에 받습니다 (캐시 없음)."""
+    df = yf.download(
+        list(tickers), period="5d", interval=interval,
+        group_by='ticker', threads=min(YF_MAX_WORKERS, len(tickers)), progress=False,
+        session=session
+    )
+    
+    # 소수 둘째 자리 표시와 RSI 계산에는 float32로 충분하므로 가격 열의 메모리를 절반으로 줄입니다
+    # (거래량은 float32 정밀도(약 1,677만)를 넘을 수 있어 그대로 둡니다)
+    price_columns = [col for col in df.columns if col[-1] in PRICE_FIELDS]
+    df[price_columns] = df[price_columns].astype(np.float32)
+    
+    return df
+
+
+@st.cache_resource
+def get_daily_bar_store():
+    """일봉 L1 캐시 - 프로세스 안에서 (종목, 뉴욕 날짜)별 일봉을 공유합니다 (락, dict)."""
+    return threading.Lock(), {}
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def get_daily_data(tickers, ny_date, _store, _session):
+    """관심 종목 일봉 (최근 5일) - 전일 종가용, 뉴욕 날짜별로 캐싱"""
+    date_key = ny_date.strftime('%Y%m%d')
+    lock, store = _store
+    
+    # 여러 세션이 동시에 부르므로 L1 dict는 락 안에서만 읽고 씁니다
+    with lock:
+        for key in [key for key in store if key[1] != date_key]:
+            del store[key]
+        frames = {
+            ticker: store[(ticker, date_key)]
+            for ticker in tickers if (ticker, date_key) in store
+        }
+    
+    # L1에 없는 종목은 재시작 후에도 남는 parquet 파일에서, 그래도 없으면 새로 받습니다
+    missing = []
+    
+    for ticker in tickers:
+        if ticker in frames:
+            continue
         
-        df['RSI'] = calculate_rsi(df['Close'], period=14)
+        path = os.path.join(YF_CACHE_DIR, f"{ticker}_{date_key}_daily.parquet")
+        try:
+            if time.time() - os.path.getmtime(path) < YF_CACHE_TTL["1d"]:
+                frames[ticker] = pd.read_parquet(path)
+                continue
+        except Exception:
+            pass
         
-        current_price = df['Close'].iloc[-1]
-        current_rsi = df['RSI'].iloc[-1] if not pd.isna(df['RSI'].iloc[-1]) else None
+        missing.append(ticker)
+    
+    if missing:
+        fetched = download_bars(missing, "1d", _session)
         
-        daily_df = stock.history(period="5d", interval="1d")
-        if len(daily_df) >= 2:
-            prev_close = daily_df['Close'].iloc[-2]
-            change_pct = ((current_price - prev_close) / prev_close) * 100
-        else:
-            prev_close = current_price
-            change_pct = 0
+        for ticker in missing:
+            df = _ticker_frame(fetched, ticker)
+            if df.empty:
+                continue
+            
+            frames[ticker] = df
+            try:
+                os.makedirs(YF_CACHE_DIR, exist_ok=True)
+                path = os.path.join(YF_CACHE_DIR, f"{ticker}_{date_key}_daily.parquet")
+                tmp_path = f"{path}.tmp"
+                df.to_parquet(tmp_path)
+                os.replace(tmp_path, path)
+            except Exception:
+                pass
         
-        return current_price, current_rsi, change_pct, prev_close, df
+        # 다른 날짜의 일봉 파일은 다시 쓰이지 않으므로 저장하는 김에 지웁니다
+        try:
+            names = os.listdir(YF_CACHE_DIR)
+        except Exception:
+            names = []
+        for name in names:
+            if name.endswith("_daily.parquet") and not name.endswith(f"_{date_key}_daily.parquet"):
+                try:
+                    os.remove(os.path.join(YF_CACHE_DIR, name))
+                except Exception:
+                    pass
+    
+    with lock:
+        for ticker, df in frames.items():
+            store[(ticker, date_key)] = df
+    
+    if not frames:
+        return pd.DataFrame()
+    
+    return pd.concat(frames, axis=1)
+
+
+def price_snapshot(minute_all, daily_all, tickers):
+    """관심 종목 전체의 현재가/전일 종가/등락률을 열 단위로 한 번에 계산합니다."""
+    minute_close = minute_all.xs('Close', axis=1, level=1).reindex(columns=list(tickers))
+    values = minute_close.to_numpy(dtype=np.float64)
+    valid = ~np.isnan(values)
+    has_data = valid.any(axis=0)
+    
+    # 열마다 마지막 유효 행 위치
+    last_pos = len(values) - 1 - np.argmax(valid[::-1], axis=0)
+    current_prices = values[last_pos, np.arange(values.shape[1])]
+    last_dates = minute_close.index[last_pos].date
+    
+    # 캐시된 일봉에 오늘 봉이 있든 없든, 마지막 1분봉 날짜 이전의 종가를 사용
+    prev_closes = np.full(len(tickers), np.nan)
+    if not daily_all.empty:
+        daily_close = daily_all.xs('Close', axis=1, level=1).reindex(columns=list(tickers))
+        before = daily_close.index.date[:, None] < last_dates[None, :]
+        prev_closes = daily_close.where(before).ffill().iloc[-1].to_numpy(dtype=np.float64)
+    # 일봉이 없는 종목은 현재가를 전일 종가로 씁니다 (등락률 0)
+    prev_closes = np.where(np.isnan(prev_closes), current_prices, prev_closes)
+    
+    snapshot = pd.DataFrame({
+        'current_price': current_prices,
+        'prev_close': prev_closes,
+        'change_pct': (current_prices - prev_closes) / prev_closes * 100,
+    }, index=list(tickers))
+    return snapshot[has_data]
+
+
+@st.cache_data(ttl=180)
+def get_all_stock_data(tickers, bucket=None):
+    """관심 종목 전체 데이터 일괄 다운로드 (1분 단위, 최근 5일) - 캐싱 적용"""
+    # tickers(정렬된 tuple)와 bucket(int(time.time() // 갱신 간격))이 캐시 키이고,
+    # ttl은 갱신 간격 슬라이더의 최대값(180초)에 맞춘 안전장치입니다
+    empty = (None, None, None, None)
+    results = {ticker: empty for ticker in tickers}
+    
+    try:
+        # st.cache_resource 함수는 스크립트 스레드에서만 부르고, 작업 스레드에는 결과를 넘깁니다
+        session = get_yf_session()
+        daily_store = get_daily_bar_store()
         
-    except Exception as e:
-        return None, None, None, None, None
+        # 1분봉/일봉 요청은 서로 독립적이므로 동시에 보내 대기 시간을 겹칩니다
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            minute_future = executor.submit(download_bars, tickers, "1m", session)
+            daily_future = executor.submit(
+                get_daily_data, tickers, datetime.now(NY_TZ).date(), daily_store, session
+            )
+            minute_all = minute_future.result()
+            daily_all = daily_future.result()
+    except Exception:
+        return results
+    
+    try:
+        snapshot = price_snapshot(minute_all, daily_all, tickers)
+    except Exception:
+        return results
+    
+    for ticker, current_price, prev_close, change_pct in snapshot.itertuples():
+        try:
+            closes = _ticker_frame(minute_all, ticker)['Close']
+            current_rsi = update_rsi_incremental(ticker, closes, period=14)
+            
+            results[ticker] = (current_price, current_rsi, change_pct, prev_close)
+        except Exception:
+            continue
+    
+    return results
+
+
+@st.cache_resource
+def get_closed_market_snapshots():
+    """장이 닫혀 있는 동안 받은 종목별 시세 - 종목 -> ((뉴욕 날짜, 시장 상태), 결과 튜플)"""
+    return {}
 
 
-def send_telegram_message(message):
+class TelegramRateLimiter:
+    """텔레그램 전송 속도 제한 (슬라이딩 윈도우, 한도를 넘으면 자리가 날 때까지 대기)"""
+    
+    # 기본값은 텔레그램 권장 한도인 전체 초당 30건, 채팅방당 분당 20건입니다
+    def __init__(self, limits=((30, 1.0), (20, 60.0))):
+        self.limits = limits
+        self._sent = [deque() for _ in limits]
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """전송 가능해질 때까지 대기한 뒤 전송 시각을 기록합니다."""
+        while True:
+            # 대기 시간만 락 안에서 계산하고, 잠은 락 밖에서 잡니다
+            # (다른 스레드의 acquire/block_for가 그동안 막히지 않도록)
+            with self._lock:
+                now = time.monotonic()
+                wait = self._blocked_until - now
+                for (max_calls, window), sent in zip(self.limits, self._sent):
+                    while sent and now - sent[0] >= window:
+                        sent.popleft()
+                    if len(sent) >= max_calls:
+                        wait = max(wait, sent[0] + window - now)
+                if wait <= 0:
+                    for sent in self._sent:
+                        sent.append(now)
+                    return
+            time.sleep(wait)
+    
+    def block_for(self, seconds):
+        """429 응답의 retry_after 동안 이후 전송을 모두 미룹니다."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+
+@st.cache_resource
+def get_telegram_rate_limiter():
+    """앱 전체에서 공유하는 텔레그램 전송 속도 제한기"""
+    return TelegramRateLimiter()
+
+
+@st.cache_resource
+def get_telegram_session():
+    """텔레그램 API용 requests.Session - 앱 전체에서 공유해 TLS 연결을 재사용합니다."""
+    # 429/5xx 응답은 Retry-After 헤더를 따라 최대 2회 재시도합니다
+    retry = Retry(
+        total=2,
+        backoff_factor=0.3,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"POST"}),
+        raise_on_status=False
+    )
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=retry))
+    return session
+
+
+def send_telegram_message(message, session=None, rate_limiter=None):
     """텔레그램 메시지 전송 (st.secrets 사용)"""
     if not BOT_TOKEN or not CHAT_ID:
         return False, "텔레그램 설정이 필요합니다. (secrets.toml 확인)"
@@ -338,12 +533,22 @@ def send_telegram_message(message):
             "text": message,
             "parse_mode": "HTML"
         }
-        response = requests.post(url, json=payload, timeout=10)
+        # 백그라운드 스레드는 스크립트 스레드에서 구해 둔 session/rate_limiter를 넘겨받습니다
+        if session is None:
+            session = get_telegram_session()
+        if rate_limiter is None:
+            rate_limiter = get_telegram_rate_limiter()
+        rate_limiter.acquire()
+        response = session.post(url, json=payload, timeout=10)
         
         if response.status_code == 200:
             return True, "메시지 전송 성공"
         else:
-            error_info = response.json().get('description', response.text)
+            error_body = response.json()
+            if response.status_code == 429:
+                retry_after = error_body.get('parameters', {}).get('retry_after', 1)
+                rate_limiter.block_for(retry_after)
+            error_info = error_body.get('description', response.text)
             return False, f"전송 실패: {error_info}"
     except requests.exceptions.Timeout:
         return False, "오류: 요청 시간 초과"
@@ -351,8 +556,88 @@ def send_telegram_message(message):
         return False, f"오류: {str(e)}"
 
 
-def check_buy_signal(ticker, current_price, rsi, change_pct, rsi_threshold=30, drop_threshold=-5, cooldown_minutes=30):
-    """매수 신호 체크 및 알림 전송 (파일 기반 쿨다운)"""
+@st.cache_resource
+def get_telegram_failures():
+    """백그라운드 전송 실패 기록 - (종목, 알림 시각 timestamp) -> 오류 메시지"""
+    return {}
+
+
+def _telegram_worker(message_queue, session, rate_limiter, failures, cooldown_db):
+    """대기열의 메시지를 하나씩 꺼내 전송하는 백그라운드 스레드 본체"""
+    while True:
+        ticker, sent_at, message = message_queue.get()
+        try:
+            success, result = send_telegram_message(message, session, rate_limiter)
+        except Exception as e:
+            success, result = False, f"오류: {str(e)}"
+        
+        # 실패하면 기록을 남기고 쿨다운 행을 지워 다음 갱신에서 다시 보내게 합니다
+        if not success:
+            cutoff = time.time() - 24 * 3600
+            for key in [key for key in failures if key[1] < cutoff]:
+                failures.pop(key, None)
+            failures[(ticker, sent_at)] = result
+            try:
+                cooldown_db.execute(
+                    "DELETE FROM cooldowns WHERE ticker = ? AND ts = ?", (ticker, sent_at)
+                )
+            except Exception:
+                pass
+        
+        message_queue.task_done()
+
+
+@st.cache_resource
+def get_telegram_queue():
+    """텔레그램 전송 대기열 - 전용 데몬 스레드 하나가 순서대로 보냅니다."""
+    # 스레드가 쓰는 공유 객체는 여기(스크립트 스레드)에서 구해 넘겨줍니다
+    message_queue = queue.Queue()
+    threading.Thread(
+        target=_telegram_worker,
+        args=(
+            message_queue, get_telegram_session(), get_telegram_rate_limiter(),
+            get_telegram_failures(), get_cooldown_db()
+        ),
+        daemon=True
+    ).start()
+    return message_queue
+
+
+def queue_telegram_message(ticker, sent_at, message):
+    """텔레그램 메시지를 전송 대기열에 넣고 바로 반환합니다 (sent_at은 알림 시각 timestamp)"""
+    if not BOT_TOKEN or not CHAT_ID:
+        return False, "텔레그램 설정이 필요합니다. (secrets.toml 확인)"
+    
+    get_telegram_queue().put((ticker, sent_at, message))
+    return True, "전송 대기열에 추가"
+
+
+def apply_telegram_failures():
+    """백그라운드 전송 실패를 알림 기록에 반영하고 새 실패 (기록, 오류) 목록을 반환합니다."""
+    failures = get_telegram_failures()
+    newly_failed = []
+    
+    for entry in st.session_state.alert_history:
+        if entry['status'] != "📤 전송 요청":
+            continue
+        error = failures.get((entry['ticker'], entry['sent_at']))
+        if error is not None:
+            entry['status'] = "⚠️ 전송 실패"
+            newly_failed.append((entry, error))
+            
+            # 스레드가 DB에서 지운 쿨다운을 세션 메모리에서도 지워 바로 다시 보낼 수 있게 합니다
+            last_alert = st.session_state.cooldowns.get(entry['ticker'])
+            if last_alert is not None and last_alert.timestamp() == entry['sent_at']:
+                st.session_state.cooldowns.pop(entry['ticker'], None)
+    
+    return newly_failed
+
+
+def check_buy_signal(ticker, current_price, rsi, change_pct, cooldowns, rsi_threshold=30, drop_threshold=-5, cooldown_minutes=30, now=None):
+    """매수 신호 체크 및 알림 전송 (넘겨받은 쿨다운 dict와 갱신 시각 now 사용)"""
+    if now is None:
+        now = datetime.now()
+    
     signals = []
     
     if rsi is not None and rsi <= rsi_threshold:
@@ -364,7 +649,7 @@ def check_buy_signal(ticker, current_price, rsi, change_pct, rsi_threshold=30, d
     if signals:
         signal_text = " / ".join(signals)
         
-        if can_send_alert(ticker, cooldown_minutes):
+        if can_send_alert(ticker, cooldowns, cooldown_minutes, now):
             message = f"""
 🚨 <b>매수 신호 포착!</b>
 
@@ -372,35 +657,33 @@ def check_buy_signal(ticker, current_price, rsi, change_pct, rsi_threshold=30, d
 💵 현재가: <b>${current_price:.2f}</b>
 📉 신호: {signal_text}
 
-⏰ 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+⏰ 시간: {now.strftime('%Y-%m-%d %H:%M:%S')}
             """
             
-            success, result = send_telegram_message(message)
-            
-            if success:
-                record_alert(ticker)
-                st.session_state.alert_history.append({
-                    'time': datetime.now().strftime('%H:%M:%S'),
-                    'ticker': ticker,
-                    'price': current_price,
-                    'signal': signal_text
-                })
-                return True, signal_text, True
-            else:
+            if not BOT_TOKEN or not CHAT_ID:
                 return True, signal_text, False
+            
+            # 전송은 백그라운드 스레드가 맡으므로 쿨다운을 먼저 기록한 뒤 대기열에 넣습니다.
+            # 전송에 실패하면 스레드가 이 쿨다운 행을 지우므로 순서를 바꾸면 안 됩니다
+            # (apply_telegram_failures 참고)
+            record_alert(ticker, cooldowns, now)
+            queue_telegram_message(ticker, now.timestamp(), message)
+            st.session_state.alert_history.append({
+                'time': now.strftime('%H:%M:%S'),
+                'ticker': ticker,
+                'price': current_price,
+                'signal': signal_text,
+                'status': "📤 전송 요청",
+                'sent_at': now.timestamp()
+            })
+            return True, signal_text, True
         else:
-            last_time = get_last_alert_time(ticker)
-            remaining = cooldown_minutes - ((datetime.now() - last_time).total_seconds() / 60) if last_time else 0
+            remaining = get_cooldown_remaining(ticker, cooldowns, cooldown_minutes, now)
             return True, f"{signal_text} (쿨다운 {remaining:.0f}분 남음)", False
     
     return False, None, False
 
 
-def rate_limited_sleep(seconds):
-    """서버 부하 방지를 위한 대기 함수"""
-    time.sleep(seconds)
-
-
 # ============================================================
 # 사이드바 구성
 # ============================================================
@@ -481,11 +764,11 @@ TELEGRAM_CHAT_ID = "your-chat-id"
     
     st.markdown("---")
     st.markdown("### ⏱️ 쿨다운 상태")
-    cooldown_data = load_cooldown_data()
+    cooldown_data = st.session_state.cooldowns
     if cooldown_data:
-        for ticker, last_time in cooldown_data.items():
-            elapsed = (datetime.now() - last_time).total_seconds() / 60
-            remaining = max(0, cooldown - elapsed)
+        now = datetime.now()
+        for ticker in cooldown_data:
+            remaining = get_cooldown_remaining(ticker, cooldown_data, cooldown, now)
             if remaining > 0:
                 st.markdown(f"⏳ **{ticker}**: {remaining:.0f}분 후 알림 가능")
             else:
@@ -494,7 +777,7 @@ TELEGRAM_CHAT_ID = "your-chat-id"
         st.caption("아직 알림 기록이 없습니다.")
     
     if st.button("🔄 쿨다운 초기화"):
-        save_cooldown_data({})
+        reset_cooldown_data()
         st.success("✅ 쿨다운이 초기화되었습니다.")
         st.rerun()
 
@@ -504,196 +787,279 @@ TELEGRAM_CHAT_ID = "your-chat-id"
 st.markdown("# 📈 미국 주식 저평가 매수 알림")
 st.markdown("##### RSI 과매도 및 급락 종목을 실시간으로 감시합니다")
 
-is_open, ny_time, market_status = is_market_open()
 
-col1, col2, col3 = st.columns([2, 2, 2])
-
-with col1:
-    if is_open:
-        st.markdown(f'<div class="status-open">🟢 {market_status}</div>', unsafe_allow_html=True)
-    else:
-        st.markdown(f'<div class="status-closed">🔴 {market_status}</div>', unsafe_allow_html=True)
-
-with col2:
-    st.markdown(f"🗽 **뉴욕 시간**: {ny_time.strftime('%Y-%m-%d %H:%M:%S')}")
-
-with col3:
-    kr_tz = pytz.timezone('Asia/Seoul')
-    kr_time = datetime.now(kr_tz)
-    st.markdown(f"🇰🇷 **한국 시간**: {kr_time.strftime('%Y-%m-%d %H:%M:%S')}")
-
-st.markdown("---")
-
-col_btn1, col_btn2, col_btn3 = st.columns([1, 1, 2])
-
-with col_btn1:
-    start_btn = st.button("🚀 실시간 감시 시작", type="primary", use_container_width=True)
-
-with col_btn2:
-    refresh_btn = st.button("🔄 데이터 새로고침", use_container_width=True)
-
-st.markdown("### 📊 관심 종목 현황")
-
-if st.session_state.watchlist:
-    data_rows = []
-    signals_detected = []
+# 감시 중에는 사이드바/제목/CSS는 그대로 두고 장 상태·시계, 시세 표와 감시 영역만
+# refresh_interval초마다 다시 실행합니다 (감시 중이 아니면 자동 갱신 없음)
+@st.fragment(run_every=refresh_interval if st.session_state.monitoring else None)
+def render_live_section():
+    """장 상태와 시계, 감시 버튼, 관심 종목 현황, 매수 신호, 알림 기록, 실시간 감시 영역"""
+    # 조각만 다시 실행될 때도 장 상태와 다른 세션의 쿨다운을 반영하도록 매번 새로 구합니다
+    is_open, ny_time, market_status = is_market_open()
+    st.session_state.cooldowns = load_cooldown_data()
+    
+    col1, col2, col3 = st.columns([2, 2, 2])
+    
+    with col1:
+        if is_open:
+            st.markdown(f'<div class="status-open">🟢 {market_status}</div>', unsafe_allow_html=True)
+        else:
+            st.markdown(f'<div class="status-closed">🔴 {market_status}</div>', unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown(f"🗽 **뉴욕 시간**: {ny_time.strftime('%Y-%m-%d %H:%M:%S')}")
+    
+    with col3:
+        # 뉴욕 시각과 같은 순간을 보여주도록 시계를 다시 읽지 않고 변환만 합니다
+        kr_time = ny_time.astimezone(KR_TZ)
+        st.markdown(f"🇰🇷 **한국 시간**: {kr_time.strftime('%Y-%m-%d %H:%M:%S')}")
+    
+    st.markdown("---")
+    
+    col_btn1, col_btn2, col_btn3, col_btn4 = st.columns([1, 1, 1, 1])
+    
+    with col_btn1:
+        start_btn = st.button("🚀 실시간 감시 시작", type="primary", use_container_width=True)
+    
+    with col_btn2:
+        refresh_btn = st.button("🔄 데이터 새로고침", use_container_width=True)
+    
+    with col_btn3:
+        stop_btn = st.button("⏹️ 감시 중지", use_container_width=True)
+    
+    # 감시 시작/중지는 조각의 자동 갱신 주기(run_every)를 바꾸므로 앱 전체를 다시 실행합니다
+    if start_btn or stop_btn:
+        st.session_state.monitoring = start_btn
+        st.session_state.start_requested = start_btn
+        st.rerun()
+    
+    for entry, error in apply_telegram_failures():
+        st.warning(f"⚠️ {entry['ticker']} 알림 전송 실패 ({entry['time']}): {error} - 다음 갱신에서 다시 보냅니다.")
     
-    progress_bar = st.progress(0)
-    status_text = st.empty()
+    st.markdown("### 📊 관심 종목 현황")
     
-    cache_buster = datetime.now().minute if refresh_btn else None
+    # 슬라이더 등 위젯을 조작할 때마다 스크립트가 재실행되므로, 마지막으로 받은
+    # 시세를 세션에 보관하고 종목 목록이나 갱신 구간이 바뀔 때만 다시 가져옵니다.
+    watchlist_key = tuple(sorted(st.session_state.watchlist))
+    fetch_key = (watchlist_key, int(time.time() // refresh_interval))
     
-    for idx, ticker in enumerate(st.session_state.watchlist):
-        status_text.text(f"📡 {ticker} 데이터 로드 중...")
-        progress_bar.progress((idx + 1) / len(st.session_state.watchlist))
+    if refresh_btn or st.session_state.get('last_fetch_key') != fetch_key:
+        if refresh_btn:
+            get_all_stock_data.clear()
         
-        current_price, rsi, change_pct, prev_close, df = get_stock_data(ticker, cache_buster)
+        if is_open:
+            fetch_tickers = watchlist_key
+        else:
+            # 장이 닫혀 있으면 1분봉이 더 바뀌지 않으므로, 같은 휴장 구간에 이미 받은
+            # 종목은 다시 받지 않고 처음 보는 종목만 가져옵니다
+            closed_key = (ny_time.date(), market_status)
+            snapshots = get_closed_market_snapshots()
+            fetch_tickers = tuple(
+                ticker for ticker in watchlist_key
+                if refresh_btn or ticker not in snapshots or snapshots[ticker][0] != closed_key
+            )
         
-        if idx < len(st.session_state.watchlist) - 1:
-            rate_limited_sleep(0.5)
+        fetched = {}
+        if fetch_tickers:
+            with st.spinner("📡 관심 종목 데이터 로드 중..."):
+                fetched = get_all_stock_data(fetch_tickers, fetch_key[1])
         
-        if current_price is not None:
-            if rsi is not None:
-                if rsi <= rsi_threshold:
-                    rsi_status = "🔴 과매도"
-                elif rsi >= 70:
-                    rsi_status = "🟡 과매수"
-                else:
-                    rsi_status = "🟢 보통"
-            else:
-                rsi_status = "⚪ N/A"
-            
-            if change_pct is not None:
-                if change_pct <= drop_threshold:
-                    change_status = "🔴"
-                elif change_pct < 0:
-                    change_status = "🟠"
-                else:
-                    change_status = "🟢"
-            else:
-                change_status = "⚪"
-            
-            data_rows.append({
-                '종목': ticker,
-                '현재가': f"${current_price:.2f}",
-                '전일종가': f"${prev_close:.2f}" if prev_close else "N/A",
-                '등락률': f"{change_status} {change_pct:.2f}%" if change_pct is not None else "N/A",
-                'RSI (14)': f"{rsi:.1f}" if rsi else "N/A",
-                '상태': rsi_status
-            })
-            
-            has_signal, signal_text, alert_sent = check_buy_signal(
-                ticker, current_price, rsi, change_pct, 
-                rsi_threshold, drop_threshold, cooldown
-            )
-            
-            if has_signal:
-                signals_detected.append({
-                    'ticker': ticker,
-                    'price': current_price,
-                    'signal': signal_text,
-                    'alert_sent': alert_sent
-                })
+        if is_open:
+            st.session_state.last_stock_data = fetched
         else:
-            data_rows.append({
-                '종목': ticker,
-                '현재가': "로드 실패",
-                '전일종가': "N/A",
-                '등락률': "N/A",
-                'RSI (14)': "N/A",
-                '상태': "⚪ 오류"
-            })
+            # 마감 직후에 받은 데이터는 마지막 봉이 빠졌을 수 있으므로 스냅샷으로 남기지 않습니다
+            settled = market_status != "장 마감" or ny_time.time() >= MARKET_SETTLE
+            for ticker, result in fetched.items():
+                if settled and result[0] is not None:
+                    snapshots[ticker] = (closed_key, result)
+            st.session_state.last_stock_data = {
+                ticker: fetched[ticker] if ticker in fetched else snapshots[ticker][1]
+                for ticker in watchlist_key
+            }
+        
+        st.session_state.last_fetch_key = fetch_key
     
-    progress_bar.empty()
-    status_text.empty()
-    
-    df_display = pd.DataFrame(data_rows)
-    st.dataframe(
-        df_display,
-        use_container_width=True,
-        hide_index=True,
-        column_config={
-            '종목': st.column_config.TextColumn('종목', width='small'),
-            '현재가': st.column_config.TextColumn('현재가', width='small'),
-            '전일종가': st.column_config.TextColumn('전일종가', width='small'),
-            '등락률': st.column_config.TextColumn('등락률', width='medium'),
-            'RSI (14)': st.column_config.TextColumn('RSI (14)', width='small'),
-            '상태': st.column_config.TextColumn('상태', width='medium'),
-        }
-    )
+    stock_data = st.session_state.last_stock_data
     
-    if signals_detected:
-        st.markdown("### 🚨 매수 신호 감지!")
-        for signal in signals_detected:
-            if signal['alert_sent']:
-                alert_icon = "📤"
-                alert_text = "알림 전송됨"
-            elif "쿨다운" in str(signal['signal']):
-                alert_icon = "⏳"
-                alert_text = "쿨다운 중"
-            else:
-                alert_icon = "⚠️"
-                alert_text = "전송 실패"
+    if st.session_state.watchlist:
+        # 표시용 값은 숫자 그대로 열 배열에 모아 DataFrame을 한 번에 만들고,
+        # 서식은 column_config에 맡깁니다 (셀마다 문자열을 만들지 않고 정렬도 가능)
+        tickers = st.session_state.watchlist
+        prices = np.full(len(tickers), np.nan, dtype=np.float32)
+        prev_closes = np.full(len(tickers), np.nan, dtype=np.float32)
+        changes = np.full(len(tickers), np.nan, dtype=np.float32)
+        rsis = np.full(len(tickers), np.nan, dtype=np.float32)
+        signals_detected = []
+        
+        # 쿨다운 dict와 현재 시각은 갱신마다 한 번만 가져와 루프 안에서는 순수 계산만 합니다
+        cooldowns = st.session_state.cooldowns
+        now = datetime.now()
+        
+        for idx, ticker in enumerate(tickers):
+            current_price, rsi, change_pct, prev_close = stock_data[ticker]
             
-            st.markdown(
-                f"""<div class="signal-alert">
-                    {alert_icon} <b>{signal['ticker']}</b> - 현재가 ${signal['price']:.2f} | {signal['signal']} ({alert_text})
-                </div>""",
-                unsafe_allow_html=True
-            )
+            if current_price is not None:
+                prices[idx] = current_price
+                prev_closes[idx] = prev_close
+                if change_pct is not None:
+                    changes[idx] = change_pct
+                if rsi is not None:
+                    rsis[idx] = rsi
+                
+                has_signal, signal_text, alert_sent = check_buy_signal(
+                    ticker, current_price, rsi, change_pct, cooldowns,
+                    rsi_threshold, drop_threshold, cooldown, now
+                )
+                
+                if has_signal:
+                    signals_detected.append({
+                        'ticker': ticker,
+                        'price': current_price,
+                        'signal': signal_text,
+                        'alert_sent': alert_sent
+                    })
+        
+        # 상태 아이콘은 종목마다 분기하지 않고 배열 전체에 조건표를 한 번에 적용합니다
+        # (NaN은 어떤 비교에도 걸리지 않으므로 먼저 걸러냅니다)
+        change_icons = np.select(
+            [np.isnan(changes), changes <= drop_threshold, changes < 0],
+            ["⚪", "🔴", "🟠"],
+            "🟢"
+        )
+        rsi_statuses = np.select(
+            [np.isnan(prices), np.isnan(rsis), rsis <= rsi_threshold, rsis >= 70],
+            ["⚪ 오류", "⚪ N/A", "🔴 과매도", "🟡 과매수"],
+            "🟢 보통"
+        )
+        
+        df_display = pd.DataFrame({
+            '종목': tickers,
+            '현재가': prices,
+            '전일종가': prev_closes,
+            '등락': change_icons,
+            '등락률': changes,
+            'RSI (14)': rsis,
+            '상태': rsi_statuses,
+        })
+        st.dataframe(
+            df_display,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                '종목': st.column_config.TextColumn('종목', width='small'),
+                '현재가': st.column_config.NumberColumn('현재가', format="$%.2f", width='small'),
+                '전일종가': st.column_config.NumberColumn('전일종가', format="$%.2f", width='small'),
+                '등락': st.column_config.TextColumn('등락', width='small'),
+                '등락률': st.column_config.NumberColumn('등락률', format="%.2f%%", width='small'),
+                'RSI (14)': st.column_config.NumberColumn('RSI (14)', format="%.1f", width='small'),
+                '상태': st.column_config.TextColumn('상태', width='medium'),
+            }
+        )
+        
+        if signals_detected:
+            st.markdown("### 🚨 매수 신호 감지!")
+            for signal in signals_detected:
+                if signal['alert_sent']:
+                    alert_icon = "📤"
+                    alert_text = "알림 전송 요청"
+                elif "쿨다운" in str(signal['signal']):
+                    alert_icon = "⏳"
+                    alert_text = "쿨다운 중"
+                else:
+                    alert_icon = "⚠️"
+                    alert_text = "전송 실패"
+                
+                st.markdown(
+                    f"""<div class="signal-alert">
+                        {alert_icon} <b>{signal['ticker']}</b> - 현재가 ${signal['price']:.2f} | {signal['signal']} ({alert_text})
+                    </div>""",
+                    unsafe_allow_html=True
+                )
+        
+        if st.session_state.alert_history:
+            st.markdown("### 📜 알림 발송 기록")
+            history_df = pd.DataFrame(st.session_state.alert_history[-10:]).drop(columns=['sent_at'])
+            st.dataframe(history_df, use_container_width=True, hide_index=True)
     
-    if st.session_state.alert_history:
-        st.markdown("### 📜 알림 발송 기록")
-        history_df = pd.DataFrame(st.session_state.alert_history[-10:])
-        st.dataframe(history_df, use_container_width=True, hide_index=True)
-
-else:
-    st.info("📋 사이드바에서 관심 종목을 추가해주세요.")
-
-if start_btn:
-    if not is_open:
-        st.warning(f"⚠️ 현재 미국 증시가 {market_status} 상태입니다. 개장 시간(09:30~16:00 EST)에 다시 시도해주세요.")
-    elif not BOT_TOKEN or not CHAT_ID:
-        st.warning("⚠️ 텔레그램 설정이 필요합니다. Streamlit Cloud의 Secrets에서 설정해주세요.")
     else:
-        st.markdown("### 🔴 실시간 감시 중...")
-        st.markdown(f"*{refresh_interval}초마다 데이터 갱신, {cooldown}분 간격으로 알림 전송*")
-        st.caption("페이지를 닫거나 새로고침하면 감시가 중단됩니다.")
-        
-        monitoring_placeholder = st.empty()
+        st.info("📋 사이드바에서 관심 종목을 추가해주세요.")
+    
+    if st.session_state.monitoring:
+        start_requested = st.session_state.pop('start_requested', False)
         
-        while True:
-            is_open, ny_time, market_status = is_market_open()
+        if not is_open or not BOT_TOKEN or not CHAT_ID:
+            if not is_open and start_requested:
+                notice = f"⚠️ 현재 미국 증시가 {market_status} 상태입니다. 개장 시간(09:30~16:00 EST)에 다시 시도해주세요."
+            elif not is_open:
+                notice = f"⚠️ 장이 마감되었습니다. ({market_status})"
+            else:
+                notice = "⚠️ 텔레그램 설정이 필요합니다. Streamlit Cloud의 Secrets에서 설정해주세요."
+            
+            # 감시를 끈 뒤 앱 전체를 다시 실행해 조각의 자동 갱신을 멈추고,
+            # 안내 문구는 세션에 넘겨 다시 실행된 화면에 보여줍니다
+            st.session_state.monitoring = False
+            st.session_state.monitor_notice = notice
+            st.rerun()
+        else:
+            st.markdown("### 🔴 실시간 감시 중...")
+            st.markdown(f"*{refresh_interval}초마다 데이터 갱신, {cooldown}분 간격으로 알림 전송*")
+            st.caption("페이지를 닫거나 새로고침하면 감시가 중단됩니다.")
             
-            if not is_open:
-                monitoring_placeholder.warning(f"⚠️ 장이 마감되었습니다. ({market_status})")
-                break
+            monitoring_placeholder = st.empty()
             
             with monitoring_placeholder.container():
-                st.markdown(f"**마지막 업데이트**: {datetime.now().strftime('%H:%M:%S')}")
+                now = datetime.now()
+                cooldowns = st.session_state.cooldowns
                 
-                cache_buster = datetime.now().timestamp()
+                st.markdown(f"**마지막 업데이트**: {now.strftime('%H:%M:%S')}")
                 
-                for idx, ticker in enumerate(st.session_state.watchlist):
-                    current_price, rsi, change_pct, prev_close, df = get_stock_data(ticker, cache_buster)
+                # 종목마다 st.text를 하나씩 내보내는 대신 행을 모아 표 하나로 그립니다
+                rows = []
+                for ticker in st.session_state.watchlist:
+                    current_price, rsi, change_pct, _ = stock_data[ticker]
                     
                     if current_price is not None:
                         has_signal, signal_text, alert_sent = check_buy_signal(
-                            ticker, current_price, rsi, change_pct,
-                            rsi_threshold, drop_threshold, cooldown
+                            ticker, current_price, rsi, change_pct, cooldowns,
+                            rsi_threshold, drop_threshold, cooldown, now
                         )
-                        
-                        status_icon = "🚨" if has_signal else "✅"
-                        alert_status = " (📤 알림 전송!)" if alert_sent else ""
-                        st.text(f"{status_icon} {ticker}: ${current_price:.2f} | RSI: {rsi:.1f if rsi else 'N/A'} | {change_pct:.2f}%{alert_status}")
+                        rows.append({
+                            '상태': "🚨" if has_signal else "✅",
+                            '종목': ticker,
+                            '현재가': current_price,
+                            'RSI (14)': rsi,
+                            '등락률': change_pct,
+                            '알림': "📤 알림 전송 요청" if alert_sent else "",
+                        })
                     else:
-                        st.text(f"⚪ {ticker}: 데이터 로드 실패")
-                    
-                    if idx < len(st.session_state.watchlist) - 1:
-                        rate_limited_sleep(1)
-            
-            rate_limited_sleep(refresh_interval)
-            st.rerun()
+                        rows.append({
+                            '상태': "⚪",
+                            '종목': ticker,
+                            '현재가': None,
+                            'RSI (14)': None,
+                            '등락률': None,
+                            '알림': "데이터 로드 실패",
+                        })
+                
+                st.dataframe(
+                    pd.DataFrame(rows),
+                    use_container_width=True,
+                    hide_index=True,
+                    column_config={
+                        '상태': st.column_config.TextColumn('상태', width='small'),
+                        '종목': st.column_config.TextColumn('종목', width='small'),
+                        '현재가': st.column_config.NumberColumn('현재가', format="$%.2f", width='small'),
+                        'RSI (14)': st.column_config.NumberColumn('RSI (14)', format="%.1f", width='small'),
+                        '등락률': st.column_config.NumberColumn('등락률', format="%.2f%%", width='small'),
+                        '알림': st.column_config.TextColumn('알림', width='medium'),
+                    }
+                )
+    
+    notice = st.session_state.pop('monitor_notice', None)
+    if notice:
+        st.warning(notice)
+
+
+render_live_section()
 
 st.markdown("---")
 st.markdown("""